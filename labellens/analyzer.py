@@ -6,18 +6,33 @@ the ingredient analysis pipeline, combining LLM reasoning with
 rule-based validation.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from functools import lru_cache
 import re
 import logging
 
+import numpy as np
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 from .profiles import UserProfile, ProfileType, HEALTH_PROFILES
 from .llm import GroqClient, get_client
-from .config import Verdict, RiskType
+from .config import Verdict, RiskType, MAX_BATCH_SIZE
+from ._fast import split_top_level
 
 logger = logging.getLogger(__name__)
 
+# Numeric severity codes; 0 is reserved for unrecognized severities
+SEVERITY_CODES = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+
+# Below this many flags a plain Python loop beats NumPy's call overhead
+_VECTORIZE_MIN_FLAGS = 8
+
 
 @dataclass
 class RiskFlag:
@@ -71,13 +86,51 @@ class AnalysisResult:
         """Convert to dictionary for JSON serialization."""
         return asdict(self)
     
+    def _severity_codes(self) -> np.ndarray:
+        """Severity of each risk flag as a uint8 array of SEVERITY_CODES."""
+        return np.fromiter(
+            (SEVERITY_CODES.get(flag.severity, 0) for flag in self.risk_flags),
+            dtype=np.uint8,
+            count=len(self.risk_flags)
+        )
+    
     def get_risk_count_by_severity(self) -> Dict[str, int]:
         """Count risks by severity level."""
-        counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-        for flag in self.risk_flags:
-            if flag.severity in counts:
-                counts[flag.severity] += 1
-        return counts
+        if len(self.risk_flags) <= _VECTORIZE_MIN_FLAGS:
+            counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
+            for flag in self.risk_flags:
+                if flag.severity in counts:
+                    counts[flag.severity] += 1
+            return counts
+        
+        tally = np.bincount(self._severity_codes(), minlength=len(SEVERITY_CODES) + 1)
+        return {
+            severity: int(tally[SEVERITY_CODES[severity]])
+            for severity in ("critical", "high", "medium", "low")
+        }
+    
+    def get_risk_flags_by_severity(self, limit: Optional[int] = None) -> List[RiskFlag]:
+        """
+        Return risk flags ordered from most to least severe.
+        
+        Flags of equal severity keep their original order.
+        
+        Args:
+            limit: Optional maximum number of flags to return
+            
+        Returns:
+            The `limit` most severe flags, or all flags if no limit is given
+        """
+        if len(self.risk_flags) <= _VECTORIZE_MIN_FLAGS:
+            ordered = sorted(
+                self.risk_flags,
+                key=lambda flag: SEVERITY_CODES.get(flag.severity, 0),
+                reverse=True
+            )
+            return ordered[:limit]
+        
+        order = np.argsort(-self._severity_codes().astype(np.int8), kind="stable")
+        return [self.risk_flags[i] for i in order[:limit]]
     
     def has_critical_risks(self) -> bool:
         """Check if any critical severity risks exist."""
@@ -119,25 +172,9 @@ class IngredientParser:
         # Split on common delimiters (comma, semicolon)
         # But preserve parenthetical content
         ingredients = []
-        current = ""
-        paren_depth = 0
-        
-        for char in text:
-            if char == '(':
-                paren_depth += 1
-                current += char
-            elif char == ')':
-                paren_depth -= 1
-                current += char
-            elif char in ',;' and paren_depth == 0:
-                if current.strip():
-                    ingredients.append(current.strip())
-                current = ""
-            else:
-                current += char
-        
-        if current.strip():
-            ingredients.append(current.strip())
+        for piece in split_top_level(text):
+            if piece.strip():
+                ingredients.append(piece.strip())
         
         return ingredients
     
@@ -218,72 +255,112 @@ class RuleBasedChecker:
         Returns:
             List of preliminary flags
         """
+        screens = cls._active_screens(user_profile)
+        if not screens:
+            return []
+        
+        match = _rule_matcher()
         flags = []
         
         for ingredient in ingredients:
-            normalized = IngredientParser.normalize(ingredient)
-            
-            # Check for sugars (relevant to diabetes, PCOS, keto)
-            sugar_profiles = {
-                ProfileType.TYPE_2_DIABETES, 
-                ProfileType.PCOS, 
-                ProfileType.KETO
-            }
-            if sugar_profiles & set(user_profile.active_profiles):
-                for sugar in cls.SUGAR_ALIASES:
-                    if sugar in normalized:
-                        flags.append({
-                            "ingredient": ingredient,
-                            "type": RiskType.HIDDEN_SUGAR,
-                            "match": sugar,
-                            "rule_based": True
-                        })
-                        break
-            
-            # Check for seed oils
-            if ProfileType.AVOID_SEED_OILS in user_profile.active_profiles:
-                for oil in cls.SEED_OILS:
-                    if oil in normalized:
-                        flags.append({
-                            "ingredient": ingredient,
-                            "type": RiskType.SEED_OIL,
-                            "match": oil,
-                            "rule_based": True
-                        })
-                        break
-            
-            # Check for high-FODMAP
-            if ProfileType.IBS_LOW_FODMAP in user_profile.active_profiles:
-                for fodmap in cls.HIGH_FODMAP:
-                    if fodmap in normalized:
-                        flags.append({
-                            "ingredient": ingredient,
-                            "type": RiskType.HIGH_FODMAP,
-                            "match": fodmap,
-                            "rule_based": True
-                        })
-                        break
-            
-            # Check for gluten
-            if ProfileType.CELIAC in user_profile.active_profiles:
-                for gluten in cls.GLUTEN_SOURCES:
-                    if gluten in normalized:
-                        flags.append({
-                            "ingredient": ingredient,
-                            "type": RiskType.CONTAINS_GLUTEN,
-                            "match": gluten,
-                            "rule_based": True
-                        })
-                        break
+            matches = match(IngredientParser.normalize(ingredient), screens)
+            for risk_type in screens:
+                if risk_type in matches:
+                    flags.append({
+                        "ingredient": ingredient,
+                        "type": risk_type,
+                        "match": matches[risk_type],
+                        "rule_based": True
+                    })
         
         return flags
+    
+    @staticmethod
+    def _active_screens(user_profile: UserProfile) -> List[str]:
+        """Risk types worth screening for, in flag order, given the active profiles."""
+        active = set(user_profile.active_profiles)
+        screens = []
+        
+        # Sugars are relevant to diabetes, PCOS and keto
+        if active & {ProfileType.TYPE_2_DIABETES, ProfileType.PCOS, ProfileType.KETO}:
+            screens.append(RiskType.HIDDEN_SUGAR)
+        if ProfileType.AVOID_SEED_OILS in active:
+            screens.append(RiskType.SEED_OIL)
+        if ProfileType.IBS_LOW_FODMAP in active:
+            screens.append(RiskType.HIGH_FODMAP)
+        if ProfileType.CELIAC in active:
+            screens.append(RiskType.CONTAINS_GLUTEN)
+        
+        return screens
+
+
+@lru_cache(maxsize=1)
+def _rule_matcher() -> Callable[[str, List[str]], Dict[str, str]]:
+    """
+    Compile the rule-based pattern sets into a single matcher.
+    
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, so each
+    ingredient is scanned once for every pattern at the same time. Falls back
+    to one precompiled regex alternation per risk type.
+    
+    Returns:
+        Function mapping (normalized text, risk types) to the first matching
+        pattern for each risk type found
+    """
+    pattern_sets = {
+        RiskType.HIDDEN_SUGAR: RuleBasedChecker.SUGAR_ALIASES,
+        RiskType.SEED_OIL: RuleBasedChecker.SEED_OILS,
+        RiskType.HIGH_FODMAP: RuleBasedChecker.HIGH_FODMAP,
+        RiskType.CONTAINS_GLUTEN: RuleBasedChecker.GLUTEN_SOURCES,
+    }
+    
+    if ahocorasick is not None:
+        # Some patterns (e.g. "honey", "wheat") belong to several risk types
+        owners: Dict[str, List[str]] = {}
+        for risk_type, patterns in pattern_sets.items():
+            for pattern in patterns:
+                owners.setdefault(pattern, []).append(risk_type)
+        
+        automaton = ahocorasick.Automaton()
+        for pattern, risk_types in owners.items():
+            automaton.add_word(pattern, (pattern, tuple(risk_types)))
+        automaton.make_automaton()
+        
+        def match(text: str, risk_types: List[str]) -> Dict[str, str]:
+            found: Dict[str, str] = {}
+            for _, (pattern, owned_by) in automaton.iter(text):
+                for risk_type in owned_by:
+                    if risk_type in risk_types and risk_type not in found:
+                        found[risk_type] = pattern
+                if len(found) == len(risk_types):
+                    break
+            return found
+        
+        return match
+    
+    regexes = {
+        risk_type: re.compile("|".join(
+            re.escape(pattern) for pattern in sorted(patterns, key=len, reverse=True)
+        ))
+        for risk_type, patterns in pattern_sets.items()
+    }
+    
+    def match(text: str, risk_types: List[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        for risk_type in risk_types:
+            hit = regexes[risk_type].search(text)
+            if hit:
+                found[risk_type] = hit.group()
+        return found
+    
+    return match
 
 
 def analyze_ingredients(
     ingredients: str,
     user_profile: UserProfile,
     client: Optional[GroqClient] = None,
-    include_deception_check: bool = True
+    on_progress: Optional[Callable[[str], None]] = None
 ) -> AnalysisResult:
     """
     Main analysis function for ingredient lists.
@@ -295,7 +372,7 @@ def analyze_ingredients(
         ingredients: Raw ingredient string from food label
         user_profile: User's health profile configuration
         client: Optional GroqClient (uses singleton if not provided)
-        include_deception_check: Whether to run additional deception detection
+        on_progress: Optional callback receiving LLM response text as it streams
         
     Returns:
         AnalysisResult with complete analysis
@@ -348,8 +425,63 @@ def analyze_ingredients(
     llm_client = client or get_client()
     
     # Perform LLM analysis
-    llm_result = llm_client.analyze_ingredients(ingredients, user_profile)
+    llm_result = llm_client.analyze_ingredients(ingredients, user_profile, on_progress)
     
+    return _build_result(llm_result, user_profile, len(parsed))
+
+
+def analyze_ingredients_batch(
+    ingredient_lists: List[str],
+    user_profile: UserProfile,
+    client: Optional[GroqClient] = None
+) -> List[AnalysisResult]:
+    """
+    Analyze several ingredient lists for one profile with as few LLM calls as possible.
+    
+    Lists that fail validation get the same error results as
+    analyze_ingredients; the rest are sent to the LLM in batches of
+    MAX_BATCH_SIZE.
+    
+    Args:
+        ingredient_lists: Raw ingredient strings from food labels
+        user_profile: User's health profile configuration
+        client: Optional GroqClient (uses singleton if not provided)
+        
+    Returns:
+        One AnalysisResult per input, in input order
+    """
+    results: List[Optional[AnalysisResult]] = [None] * len(ingredient_lists)
+    parsed_lists = [IngredientParser.parse(i) for i in ingredient_lists]
+    has_profiles = bool(user_profile.active_profiles or user_profile.custom_restrictions)
+    
+    pending = []
+    for index, parsed in enumerate(parsed_lists):
+        if parsed and has_profiles:
+            pending.append(index)
+        else:
+            # Returns the validation error without calling the LLM
+            results[index] = analyze_ingredients(ingredient_lists[index], user_profile, client)
+    
+    if pending:
+        llm_client = client or get_client()
+        for start in range(0, len(pending), MAX_BATCH_SIZE):
+            chunk = pending[start:start + MAX_BATCH_SIZE]
+            llm_results = llm_client.analyze_ingredients_batch(
+                [ingredient_lists[i] for i in chunk],
+                user_profile
+            )
+            for index, llm_result in zip(chunk, llm_results):
+                results[index] = _build_result(llm_result, user_profile, len(parsed_lists[index]))
+    
+    return results
+
+
+def _build_result(
+    llm_result: Dict[str, Any],
+    user_profile: UserProfile,
+    ingredient_count: int
+) -> AnalysisResult:
+    """Convert a normalized LLM result dict into an AnalysisResult."""
     if llm_result.get("error"):
         return AnalysisResult(
             overall_verdict=Verdict.CAUTION,
@@ -363,7 +495,7 @@ def analyze_ingredients(
             summary=llm_result.get("summary", "Analysis failed"),
             analyzed_profiles=user_profile.get_display_names(),
             timestamp=datetime.utcnow().isoformat(),
-            ingredient_count=len(parsed),
+            ingredient_count=ingredient_count,
             error=True,
             error_message=llm_result.get("error_message", "Unknown error")
         )
@@ -410,7 +542,7 @@ def analyze_ingredients(
         summary=llm_result.get("summary", "Analysis complete."),
         analyzed_profiles=user_profile.get_display_names(),
         timestamp=datetime.utcnow().isoformat(),
-        ingredient_count=len(parsed),
+        ingredient_count=ingredient_count,
         error=False
     )
 
@@ -488,7 +620,7 @@ def _generate_markdown_report(result: AnalysisResult) -> str:
     if result.risk_flags:
         lines.append("## ⚠️ Risk Flags")
         lines.append("")
-        for flag in result.risk_flags:
+        for flag in result.get_risk_flags_by_severity():
             severity_emoji = {
                 "critical": "🔴",
                 "high": "🟠",
@@ -567,7 +699,7 @@ def _generate_plain_report(result: AnalysisResult) -> str:
     if result.risk_flags:
         lines.append("RISK FLAGS:")
         lines.append("-" * 20)
-        for flag in result.risk_flags:
+        for flag in result.get_risk_flags_by_severity():
             lines.append(f"• {flag.ingredient} [{flag.severity}]")
             lines.append(f"  Type: {flag.risk_type}")
             lines.append(f"  {flag.explanation}")
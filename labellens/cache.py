@@ -0,0 +1,354 @@
+"""
+LabelLens Analysis Cache
+
+Reuses analysis results across rescans of the same product. Two scans of
+one label rarely OCR to the exact same string, so lookups go through a
+normalized exact-match tier first and a near-duplicate tier second.
+"""
+
+import hashlib
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9, ]")
+_DIGIT_RE = re.compile(r"[0-9]")
+
+# Real ingredient names one edit away from another real name; swapping two
+# of them is a substitution, never a misread
+_INGREDIENT_WORDS = frozenset({
+    "nitrite", "nitrate", "citrate", "sulfite", "sulfate", "sulphite",
+    "sulphate", "lactose", "lactase", "lactate", "maltose", "maltase",
+    "pectin", "lectin", "butter", "batter", "gelatin", "gelatine",
+    "sugar", "sugars", "flour", "flours", "starch", "starches",
+})
+
+EMBEDDING_DIM = 384
+
+
+def normalize_ingredients(text: str) -> str:
+    """
+    Normalize an ingredient list so trivially different scans compare equal.
+
+    Args:
+        text: Raw ingredient text from OCR or user input
+
+    Returns:
+        Lowercased, punctuation-free ingredients, comma-joined in label order
+    """
+    # Order is kept: labels list ingredients by weight, so a reordered
+    # list is a different product
+    text = _WHITESPACE_RE.sub(" ", text.lower())
+    text = _NON_ALNUM_RE.sub("", text)
+    items = (item.strip() for item in text.split(","))
+    return ", ".join(item for item in items if item)
+
+
+def embed_ingredients(normalized: str) -> np.ndarray:
+    """
+    Embed normalized ingredient text as a unit vector of hashed character trigrams.
+
+    Trigrams keep OCR slips such as "sugal" close to "sugar" without
+    loading a sentence-embedding model.
+
+    Args:
+        normalized: Output of normalize_ingredients
+
+    Returns:
+        float32 vector of length EMBEDDING_DIM with unit L2 norm
+    """
+    padded = f"  {normalized}  "
+    buckets = [
+        zlib.crc32(padded[i:i + 3].encode()) % EMBEDDING_DIM
+        for i in range(len(padded) - 2)
+    ]
+    vector = np.bincount(buckets, minlength=EMBEDDING_DIM).astype(np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance between two strings, giving up once it exceeds limit.
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Largest distance the caller cares about
+
+    Returns:
+        The distance, or limit + 1 if it is larger than limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _misread(word: str, other: str) -> bool:
+    """
+    Whether two differing words could be one word misread by OCR.
+
+    Args:
+        word: A word from one label
+        other: The word in the same position on the other label
+
+    Returns:
+        True if the words are one character edit apart and neither edit
+        could change the ingredient
+    """
+    # Digits carry meaning: "yellow 5" and "red 40" are distinct dyes
+    if _DIGIT_RE.search(word) or _DIGIT_RE.search(other):
+        return False
+    if word in _INGREDIENT_WORDS and other in _INGREDIENT_WORDS:
+        return False
+    # Short names get no slack: "salt" and "malt", "rice" and "rye"
+    if min(len(word), len(other)) < 5:
+        return False
+    return _edit_distance(word, other, 1) <= 1
+
+
+def _only_ocr_noise(
+    items: Tuple[str, ...],
+    other: Tuple[str, ...],
+    guard_terms: Tuple[str, ...] = ()
+) -> bool:
+    """
+    Whether two ingredient lists differ only by small misspellings.
+
+    Ingredients are compared in label order and word by word, so a
+    reordered list, a substituted ingredient or a changed number never
+    matches. Ingredients naming a guard term must match exactly.
+
+    Args:
+        items: Normalized ingredients of one label
+        other: Normalized ingredients of the other label
+        guard_terms: Lowercased terms that may not differ at all
+
+    Returns:
+        True if every differing word looks like an OCR misread
+    """
+    if len(items) != len(other):
+        return False
+    for item, candidate in zip(items, other):
+        if item == candidate:
+            continue
+        if any(term in item or term in candidate for term in guard_terms):
+            return False
+        words, candidate_words = item.split(), candidate.split()
+        if len(words) != len(candidate_words):
+            return False
+        for word, candidate_word in zip(words, candidate_words):
+            if word != candidate_word and not _misread(word, candidate_word):
+                return False
+    return True
+
+
+def analysis_key(ingredients: str, profile_key: Hashable) -> str:
+    """
+    Stable key for an ingredient list and profile, shared by all cache tiers.
+
+    Args:
+        ingredients: Raw ingredient text
+        profile_key: Hashable description of the analysis profile
+
+    Returns:
+        Hex digest of the normalized ingredients and profile
+    """
+    return _digest(normalize_ingredients(ingredients), profile_key)
+
+
+def _items(normalized: str) -> Tuple[str, ...]:
+    return tuple(normalized.split(", "))
+
+
+def _digest(normalized: str, profile_key: Hashable) -> str:
+    return hashlib.sha1(f"{normalized}|{profile_key!r}".encode()).hexdigest()
+
+
+def _quantize(vector: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Quantize a vector to int8 with a single scale factor.
+
+    Args:
+        vector: float32 embedding
+
+    Returns:
+        (int8 codes, scale) such that codes * scale approximates vector
+    """
+    peak = float(np.abs(vector).max())
+    if not peak:
+        return np.zeros(vector.shape, dtype=np.int8), 0.0
+    codes = np.clip(np.rint(vector * (127.0 / peak)), -127, 127).astype(np.int8)
+    return codes, peak / 127.0
+
+
+@dataclass
+class _CacheEntry:
+    """A cached result plus the features used to match near-duplicates."""
+    profile_key: Hashable
+    item_count: int
+    items: Tuple[str, ...]  # normalized ingredients, checked before a fuzzy hit is served
+    guard_hits: FrozenSet[str]
+    slot: int  # row of the entry's embedding in AnalysisCache._matrix
+    result: Any
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU cache of analysis results with a near-duplicate tier.
+
+    A near-duplicate only counts as a hit when it was analyzed for the same
+    profile, lists the same number of ingredients in the same order,
+    contains exactly the same guard terms (typically the profile's avoid
+    keywords) and differs only by single-letter misreads of words that are
+    not numbers or known ingredient names. A label with any substituted or
+    reordered ingredient, risky for the profile or not, is never served
+    another label's verdict.
+
+    Embeddings are stored int8-quantized in one preallocated matrix with a
+    per-row scale, so a lookup is a single integer matmul over the rows of
+    the matching candidates.
+    """
+
+    def __init__(self, max_entries: int = 512, similarity_threshold: float = 0.97):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._matrix = np.zeros((max_entries, EMBEDDING_DIM), dtype=np.int8)
+        self._scales = np.zeros(max_entries, dtype=np.float32)
+        self._free_slots: List[int] = list(range(max_entries - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _guard_hits(normalized: str, guard_terms: Tuple[str, ...]) -> FrozenSet[str]:
+        return frozenset(term for term in guard_terms if term in normalized)
+
+    def get(
+        self,
+        ingredients: str,
+        profile_key: Hashable,
+        guard_terms: Iterable[str] = ()
+    ) -> Optional[Any]:
+        """
+        Look up a result for these ingredients and profile.
+
+        Args:
+            ingredients: Raw ingredient text
+            profile_key: Hashable description of the analysis profile
+            guard_terms: Terms whose presence must match for a fuzzy hit
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        normalized = normalize_ingredients(ingredients)
+        key = _digest(normalized, profile_key)
+        guard_terms = tuple(term.lower() for term in guard_terms)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry.result
+
+            item_count = normalized.count(",") + 1
+            guard_hits = self._guard_hits(normalized, guard_terms)
+            candidates = [
+                (k, e) for k, e in self._entries.items()
+                if e.profile_key == profile_key
+                and e.item_count == item_count
+                and e.guard_hits == guard_hits
+            ]
+            if not candidates:
+                return None
+
+            query, query_scale = _quantize(embed_ingredients(normalized))
+            rows = np.fromiter((e.slot for _, e in candidates), dtype=np.intp, count=len(candidates))
+            # int32 accumulation: 384 products of up to 127 * 127 overflow int16
+            dots = np.einsum(
+                "ij,j->i",
+                self._matrix[rows].astype(np.int32),
+                query.astype(np.int32)
+            )
+            scores = dots * self._scales[rows] * query_scale
+            items = _items(normalized)
+            for best in np.argsort(-scores):
+                if scores[best] < self.similarity_threshold:
+                    break
+                best_key, best_entry = candidates[best]
+                if not _only_ocr_noise(items, best_entry.items, guard_terms):
+                    continue
+                self._entries.move_to_end(best_key)
+                logger.info(f"Near-duplicate cache hit (similarity {scores[best]:.3f})")
+                return best_entry.result
+            return None
+
+    def put(
+        self,
+        ingredients: str,
+        profile_key: Hashable,
+        result: Any,
+        guard_terms: Iterable[str] = ()
+    ) -> None:
+        """
+        Store a result for these ingredients and profile.
+
+        Args:
+            ingredients: Raw ingredient text
+            profile_key: Hashable description of the analysis profile
+            result: Value to cache
+            guard_terms: Terms whose presence must match for a fuzzy hit
+        """
+        normalized = normalize_ingredients(ingredients)
+        codes, scale = _quantize(embed_ingredients(normalized))
+        item_count = normalized.count(",") + 1
+        guard_hits = self._guard_hits(normalized, tuple(term.lower() for term in guard_terms))
+
+        with self._lock:
+            key = _digest(normalized, profile_key)
+            existing = self._entries.pop(key, None)
+            if existing is not None:
+                slot = existing.slot
+            else:
+                if not self._free_slots:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._free_slots.append(evicted.slot)
+                slot = self._free_slots.pop()
+
+            self._matrix[slot] = codes
+            self._scales[slot] = scale
+            self._entries[key] = _CacheEntry(
+                profile_key=profile_key,
+                item_count=item_count,
+                items=_items(normalized),
+                guard_hits=guard_hits,
+                slot=slot,
+                result=result,
+            )
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+            self._free_slots = list(range(self.max_entries - 1, -1, -1))
@@ -15,6 +15,17 @@ GROQ_MODEL = "llama-3.3-70b-versatile"  # Fast and capable model
 # Analysis Configuration
 MAX_RETRIES = 3
 RETRY_DELAY = 1.0  # seconds
+MAX_BATCH_SIZE = 4  # ingredient lists per batched LLM request
+
+# HTTP connection pool shared by all Groq requests
+HTTP_MAX_KEEPALIVE = 8
+HTTP_KEEPALIVE_EXPIRY = 60.0  # seconds
+HTTP_TIMEOUT = 60.0  # seconds
+
+# Persistent cache (requires the optional diskcache package)
+CACHE_DIR = os.getenv("LABELLENS_CACHE_DIR", "./.cache/labellens")
+CACHE_SIZE_LIMIT = 2 * 2**30  # bytes
+CACHE_TTL = 30 * 24 * 3600  # seconds an entry may be served before it is recomputed
 
 # Verdicts
 class Verdict:
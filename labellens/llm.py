@@ -7,11 +7,16 @@ including prompt construction, response parsing, and error handling.
 
 import json
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from typing import Callable, Dict, Any, Optional, List
+import httpx
 from groq import Groq
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
-from .config import GROQ_API_KEY, GROQ_MODEL, MAX_RETRIES, RETRY_DELAY, Verdict
+from .config import (
+    GROQ_API_KEY, GROQ_MODEL, MAX_RETRIES, RETRY_DELAY, Verdict,
+    HTTP_MAX_KEEPALIVE, HTTP_KEEPALIVE_EXPIRY, HTTP_TIMEOUT
+)
 from .profiles import UserProfile
 
 # Configure logging
@@ -19,6 +24,104 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# JSON shape expected for a single ingredient analysis
+ANALYSIS_JSON_FORMAT = """{
+    "overall_verdict": "SAFE" or "CAUTION" or "AVOID",
+    "confidence_score": 0.0 to 1.0,
+    "risk_flags": [
+        {
+            "ingredient": "exact ingredient name from list",
+            "risk_type": "hidden_sugar|allergen|metabolic_conflict|high_sodium|high_fodmap|contains_gluten|high_glycemic|seed_oil|high_protein|not_keto_friendly|uncertainty|deceptive_marketing",
+            "severity": "low|medium|high|critical",
+            "explanation": "Brief, clear explanation of why this is problematic for this patient",
+            "relevant_profiles": ["list of affected profile names"]
+        }
+    ],
+    "deception_alerts": [
+        {
+            "claim": "marketing claim or misleading term",
+            "reality": "what it actually means",
+            "concern_level": "low|medium|high"
+        }
+    ],
+    "uncertainty_flags": [
+        {
+            "ingredient": "ambiguous ingredient like 'natural flavors'",
+            "possible_concerns": ["list of possible hidden ingredients"],
+            "recommendation": "brief recommendation"
+        }
+    ],
+    "safe_for_general_public": true or false,
+    "user_specific_warning": true or false,
+    "smart_swaps": [
+        {
+            "avoid": "problematic ingredient or product type",
+            "try_instead": "safer alternative",
+            "reason": "why this swap works for this patient"
+        }
+    ],
+    "summary": "2-3 sentence plain-English summary for the user"
+}"""
+
+# Bump when editing the static prompts below. Groq caches identical prompt
+# prefixes, so these blocks must stay free of per-user or per-request values
+# and always come first in the conversation.
+PROMPT_VERSION = "v1"
+
+STATIC_SYSTEM_PROMPT_V1 = f"""You are an expert clinical nutritionist and food scientist specializing in personalized dietary analysis. The patient's health profiles are given at the end of this message.
+
+YOUR TASK:
+Analyze ingredient lists from food products and identify risks SPECIFIC to this patient's health profiles.
+
+CRITICAL INSTRUCTIONS:
+1. Focus ONLY on risks relevant to the specified health profiles
+2. Flag hidden ingredients that might not be obvious (e.g., "natural flavors" hiding garlic for IBS)
+3. Identify deceptive marketing terms (e.g., "no added sugar" but contains maltodextrin)
+4. Consider ingredient order (first ingredients are most prevalent)
+5. Handle uncertainty explicitly - if "natural flavors" or "spices" could contain problematic ingredients, flag with probability
+6. Provide smart swap suggestions that are SAFE for all active profiles
+
+IMPORTANT CONSTRAINTS:
+- Do NOT provide medical advice
+- Use evidence-based reasoning only
+- Explain risks in simple, grocery-aisle-friendly language
+- When uncertain, lean toward caution but acknowledge uncertainty
+
+OUTPUT FORMAT:
+You MUST respond with valid JSON only, no additional text or markdown code blocks.
+Each analysis must be a JSON object in EXACTLY this format:
+{ANALYSIS_JSON_FORMAT}
+"""
+
+DECEPTION_SYSTEM_PROMPT_V1 = """You are a food labeling expert detecting deceptive marketing practices.
+Analyze ingredient lists for semantic deception - cases where the labeling is technically legal but misleading to consumers.
+
+Look for:
+1. Sugar disguised under alternative names
+2. "No added sugar" products with high-glycemic ingredients
+3. "Natural" claims on highly processed ingredients
+4. Serving size manipulation
+5. Health halos (implying benefits not supported by ingredients)
+6. Allergen obfuscation
+7. "Clean label" ingredients that aren't actually healthier
+
+Respond with valid JSON only, in this format:
+{
+    "deception_detected": true or false,
+    "deception_score": 0.0 to 1.0,
+    "findings": [
+        {
+            "type": "category of deception",
+            "evidence": "specific ingredient or claim",
+            "explanation": "why this is deceptive",
+            "severity": "low|medium|high"
+        }
+    ],
+    "overall_assessment": "brief summary"
+}
+"""
+
+
 class GroqClient:
     """
     Client for interacting with Groq API.
@@ -27,6 +130,11 @@ class GroqClient:
     with built-in retry logic and error handling.
     """
     
+    # Requests re-issued after a failed streaming analysis, for cost tracking;
+    # clients on different Streamlit sessions share the count
+    retried_requests = 0
+    _retry_lock = threading.Lock()
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize the Groq client.
@@ -41,12 +149,25 @@ class GroqClient:
                 "or pass api_key to GroqClient."
             )
         
-        self.client = Groq(api_key=self.api_key)
+        # Keep-alive pool so repeat calls skip the TCP/TLS handshake
+        self.client = Groq(
+            api_key=self.api_key,
+            http_client=httpx.Client(
+                timeout=HTTP_TIMEOUT,
+                limits=httpx.Limits(
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                )
+            )
+        )
         self.model = GROQ_MODEL
     
     def _build_system_prompt(self, user_profile: UserProfile) -> str:
         """
         Build a context-aware system prompt based on user's health profile.
+        
+        The static instructions and schema come first so every request
+        shares a cacheable prefix; the profile block follows them.
         """
         profile_names = ", ".join(user_profile.get_display_names())
         combined_context = user_profile.get_combined_context()
@@ -59,34 +180,14 @@ could cause severe allergic reactions or immediate health emergencies.
 Err on the side of extreme caution for these profiles.
 """
         
-        return f"""You are an expert clinical nutritionist and food scientist specializing in personalized dietary analysis for patients with the following conditions:
+        return f"""{STATIC_SYSTEM_PROMPT_V1}
+PATIENT PROFILE:
 
 **Active Health Profiles:** {profile_names}
 
 {combined_context}
 
-{severity_note}
-
-YOUR TASK:
-Analyze ingredient lists from food products and identify risks SPECIFIC to this patient's health profiles.
-
-CRITICAL INSTRUCTIONS:
-1. Focus ONLY on risks relevant to the specified health profiles
-2. Flag hidden ingredients that might not be obvious (e.g., "natural flavors" hiding garlic for IBS)
-3. Identify deceptive marketing terms (e.g., "no added sugar" but contains maltodextrin)
-4. Consider ingredient order (first ingredients are most prevalent)
-5. Handle uncertainty explicitly - if "natural flavors" or "spices" could contain problematic ingredients, flag with probability
-6. Provide smart swap suggestions that are SAFE for all active profiles
-
-IMPORTANT CONSTRAINTS:
-- Do NOT provide medical advice
-- Use evidence-based reasoning only
-- Explain risks in simple, grocery-aisle-friendly language
-- When uncertain, lean toward caution but acknowledge uncertainty
-
-OUTPUT FORMAT:
-You MUST respond with valid JSON only, no additional text or markdown code blocks.
-"""
+{severity_note}"""
 
     def _build_analysis_prompt(self, ingredients: str) -> str:
         """
@@ -97,82 +198,65 @@ You MUST respond with valid JSON only, no additional text or markdown code block
 INGREDIENTS:
 {ingredients}
 
-Respond with a JSON object in EXACTLY this format (no markdown, just raw JSON):
-{{
-    "overall_verdict": "SAFE" or "CAUTION" or "AVOID",
-    "confidence_score": 0.0 to 1.0,
-    "risk_flags": [
-        {{
-            "ingredient": "exact ingredient name from list",
-            "risk_type": "hidden_sugar|allergen|metabolic_conflict|high_sodium|high_fodmap|contains_gluten|high_glycemic|seed_oil|high_protein|not_keto_friendly|uncertainty|deceptive_marketing",
-            "severity": "low|medium|high|critical",
-            "explanation": "Brief, clear explanation of why this is problematic for this patient",
-            "relevant_profiles": ["list of affected profile names"]
-        }}
-    ],
-    "deception_alerts": [
-        {{
-            "claim": "marketing claim or misleading term",
-            "reality": "what it actually means",
-            "concern_level": "low|medium|high"
-        }}
-    ],
-    "uncertainty_flags": [
-        {{
-            "ingredient": "ambiguous ingredient like 'natural flavors'",
-            "possible_concerns": ["list of possible hidden ingredients"],
-            "recommendation": "brief recommendation"
-        }}
-    ],
-    "safe_for_general_public": true or false,
-    "user_specific_warning": true or false,
-    "smart_swaps": [
-        {{
-            "avoid": "problematic ingredient or product type",
-            "try_instead": "safer alternative",
-            "reason": "why this swap works for this patient"
-        }}
-    ],
-    "summary": "2-3 sentence plain-English summary for the user"
-}}
+Remember: Respond ONLY with the JSON object, no markdown formatting or code blocks."""
+
+    def _build_batch_prompt(self, ingredient_lists: List[str]) -> str:
+        """
+        Build a single prompt that analyzes several ingredient lists at once.
+        """
+        count = len(ingredient_lists)
+        labels = "\n\n".join(
+            f"LABEL {i}:\n{ingredients}"
+            for i, ingredients in enumerate(ingredient_lists, 1)
+        )
+        return f"""Analyze each of the following {count} ingredient lists separately for this patient:
+
+{labels}
+
+Respond with a JSON object of the form {{"results": [...]}} where "results" contains exactly {count} analysis objects in the format above, one per label, in label order.
 
 Remember: Respond ONLY with the JSON object, no markdown formatting or code blocks."""
 
+    def _request_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int = 2048,
+        is_retry: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Make a single JSON-mode call to Groq API, without retries.
+        """
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.3,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+        self._log_usage(getattr(response, "usage", None), is_retry)
+        
+        return self._parse_json_response(response.choices[0].message.content)
+    
     @retry(
         stop=stop_after_attempt(MAX_RETRIES),
         wait=wait_exponential(multiplier=RETRY_DELAY, min=1, max=10),
         retry=retry_if_exception_type((json.JSONDecodeError, ValueError))
     )
-    def _call_groq(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+    def _call_groq(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int = 2048
+    ) -> Dict[str, Any]:
         """
         Make a call to Groq API with retry logic.
         """
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2048,
-                response_format={"type": "json_object"}
-            )
-            
-            response_text = response.choices[0].message.content.strip()
-            
-            # Handle potential markdown code blocks
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            response_text = response_text.strip()
-            
-            return json.loads(response_text)
-            
+            return self._request_json(system_prompt, user_prompt, max_tokens)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse Groq response as JSON: {e}")
             raise
@@ -180,15 +264,90 @@ Remember: Respond ONLY with the JSON object, no markdown formatting or code bloc
             logger.error(f"Groq API call failed: {e}")
             raise
     
+    def _stream_groq(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        on_delta: Callable[[str], None]
+    ) -> Dict[str, Any]:
+        """
+        Make a streaming JSON-mode call to Groq API, reporting text as it arrives.
+        """
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.3,
+            max_tokens=2048,
+            response_format={"type": "json_object"},
+            stream=True
+        )
+        
+        parts = []
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                on_delta(delta)
+            # Groq reports usage on the final chunk under x_groq
+            usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+            if usage is not None:
+                self._log_usage(usage)
+        
+        return self._parse_json_response("".join(parts))
+    
+    @classmethod
+    def _log_usage(cls, usage: Any, is_retry: bool = False) -> None:
+        """
+        Log prompt token usage, including how much was served from the prefix cache.
+        
+        Args:
+            usage: Usage block from a Groq response, or None
+            is_retry: Whether the request re-issued a failed streaming analysis
+        """
+        retry_note = ""
+        if is_retry:
+            with cls._retry_lock:
+                cls.retried_requests += 1
+                retry_note = f", retry #{cls.retried_requests}"
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) or 0
+        logger.info(
+            f"Groq usage ({PROMPT_VERSION}{retry_note}): {usage.prompt_tokens} prompt tokens, "
+            f"{cached} cached, {usage.completion_tokens} completion tokens"
+        )
+    
+    @staticmethod
+    def _parse_json_response(response_text: str) -> Dict[str, Any]:
+        """Parse a JSON response, tolerating markdown code fences."""
+        response_text = response_text.strip()
+        
+        # Handle potential markdown code blocks
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        
+        return json.loads(response_text.strip())
+    
     def analyze_ingredients(
         self, 
         ingredients: str, 
-        user_profile: UserProfile
+        user_profile: UserProfile,
+        on_progress: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Analyze ingredients against a user's health profile.
         
-        This is the main entry point for ingredient analysis.
+        This is the main entry point for ingredient analysis. When
+        on_progress is given, the response is streamed and each text
+        delta is passed to it as it arrives.
         """
         if not ingredients or not ingredients.strip():
             return self._empty_result("No ingredients provided")
@@ -200,12 +359,59 @@ Remember: Respond ONLY with the JSON object, no markdown formatting or code bloc
         analysis_prompt = self._build_analysis_prompt(ingredients)
         
         try:
-            result = self._call_groq(system_prompt, analysis_prompt)
+            if on_progress is None:
+                result = self._call_groq(system_prompt, analysis_prompt)
+            else:
+                try:
+                    result = self._stream_groq(system_prompt, analysis_prompt, on_progress)
+                except Exception as e:
+                    # One paid retry, not the full retry policy of _call_groq
+                    logger.warning(f"Streaming analysis failed, retrying once without streaming: {e}")
+                    result = self._request_json(system_prompt, analysis_prompt, is_retry=True)
             return self._validate_and_normalize(result)
         except Exception as e:
             logger.error(f"Analysis failed: {e}")
             return self._error_result(str(e))
     
+    def analyze_ingredients_batch(
+        self,
+        ingredient_lists: List[str],
+        user_profile: UserProfile
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several ingredient lists against one profile in a single request.
+        
+        Sharing one request amortizes the system prompt and round-trip across
+        labels. Falls back to one request per label if the batched response
+        cannot be matched up with its inputs.
+        
+        Args:
+            ingredient_lists: Non-empty ingredient strings to analyze
+            user_profile: Profile applied to every list
+            
+        Returns:
+            One normalized result dict per input, in input order
+        """
+        if len(ingredient_lists) == 1 or not user_profile.active_profiles:
+            return [self.analyze_ingredients(i, user_profile) for i in ingredient_lists]
+        
+        system_prompt = self._build_system_prompt(user_profile)
+        batch_prompt = self._build_batch_prompt(ingredient_lists)
+        
+        try:
+            response = self._call_groq(
+                system_prompt,
+                batch_prompt,
+                max_tokens=2048 * len(ingredient_lists)
+            )
+            results = response.get("results")
+            if not isinstance(results, list) or len(results) != len(ingredient_lists):
+                raise ValueError("Batch response does not contain one result per label")
+            return [self._validate_and_normalize(r) for r in results]
+        except Exception as e:
+            logger.warning(f"Batch analysis failed, analyzing labels individually: {e}")
+            return [self.analyze_ingredients(i, user_profile) for i in ingredient_lists]
+    
     def detect_semantic_deception(
         self, 
         ingredients: str,
@@ -218,43 +424,15 @@ Remember: Respond ONLY with the JSON object, no markdown formatting or code bloc
         if product_claims:
             claims_text = f"\n\nMARKETING CLAIMS ON PACKAGE:\n" + "\n".join(f"- {c}" for c in product_claims)
         
-        system_prompt = """You are a food labeling expert detecting deceptive marketing practices.
-Analyze ingredient lists for semantic deception - cases where the labeling is technically legal but misleading to consumers.
-Respond with valid JSON only."""
-
         user_prompt = f"""Analyze this ingredient list for semantic deception:
 
 INGREDIENTS:
 {ingredients}
 {claims_text}
-
-Look for:
-1. Sugar disguised under alternative names
-2. "No added sugar" products with high-glycemic ingredients
-3. "Natural" claims on highly processed ingredients
-4. Serving size manipulation
-5. Health halos (implying benefits not supported by ingredients)
-6. Allergen obfuscation
-7. "Clean label" ingredients that aren't actually healthier
-
-Respond with JSON only:
-{{
-    "deception_detected": true or false,
-    "deception_score": 0.0 to 1.0,
-    "findings": [
-        {{
-            "type": "category of deception",
-            "evidence": "specific ingredient or claim",
-            "explanation": "why this is deceptive",
-            "severity": "low|medium|high"
-        }}
-    ],
-    "overall_assessment": "brief summary"
-}}
 """
         
         try:
-            result = self._call_groq(system_prompt, user_prompt)
+            result = self._call_groq(DECEPTION_SYSTEM_PROMPT_V1, user_prompt)
             return result
         except Exception as e:
             logger.error(f"Deception detection failed: {e}")
@@ -322,23 +500,41 @@ Respond with JSON only:
 
 # Convenience function for module-level access
 _client: Optional[GroqClient] = None
+_client_lock = threading.Lock()
 
 def get_client(api_key: Optional[str] = None) -> GroqClient:
     """
     Get or create a singleton GroqClient instance.
+    
+    Shared by every session and worker thread in the process so they all
+    reuse one connection pool.
     """
     global _client
     if _client is None:
-        _client = GroqClient(api_key)
+        with _client_lock:
+            if _client is None:
+                _client = GroqClient(api_key)
     return _client
 
 
 # OCR reader singleton (lazy loaded)
 _ocr_reader = None
 _ocr_type = None  # 'tesseract' or 'easyocr'
+_ocr_lock = threading.Lock()
 
 def _get_ocr_reader():
     """Get or create the OCR reader (lazy loaded for performance). Tries pytesseract first (lighter), falls back to easyocr."""
+    if _ocr_reader is not None:
+        return _ocr_reader, _ocr_type
+    
+    # The app warms the reader from a background thread; the lock makes a
+    # scan that arrives mid-load wait for that model instead of loading another
+    with _ocr_lock:
+        return _load_ocr_reader()
+
+
+def _load_ocr_reader():
+    """Load the first available OCR engine; caller holds _ocr_lock."""
     global _ocr_reader, _ocr_type
     
     if _ocr_reader is not None:
@@ -347,8 +543,9 @@ def _get_ocr_reader():
     # Try pytesseract first (lighter, faster to deploy)
     try:
         import pytesseract
-        _ocr_reader = pytesseract
+        # Type before reader: the unlocked fast path checks only the reader
         _ocr_type = 'tesseract'
+        _ocr_reader = pytesseract
         logger.info("Using pytesseract for OCR")
         return _ocr_reader, _ocr_type
     except ImportError:
@@ -357,8 +554,9 @@ def _get_ocr_reader():
     # Fall back to easyocr
     try:
         import easyocr
-        _ocr_reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+        reader = easyocr.Reader(['en'], gpu=False, verbose=False)
         _ocr_type = 'easyocr'
+        _ocr_reader = reader
         logger.info("Using easyocr for OCR")
         return _ocr_reader, _ocr_type
     except ImportError:
@@ -387,19 +585,18 @@ def extract_ingredients_from_image(image_bytes: bytes, api_key: Optional[str] =
         # Convert bytes to PIL Image
         image = Image.open(io.BytesIO(image_bytes))
         
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Resize large images for faster processing
+        # Let the JPEG decoder downscale and emit grayscale directly instead
+        # of materializing a full-resolution color photo and converting it
         max_dimension = 1200
-        if max(image.size) > max_dimension:
-            ratio = max_dimension / max(image.size)
-            new_size = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-            image = image.resize(new_size, Image.LANCZOS)
+        image.draft('L', (max_dimension, max_dimension))
+        
+        # Grayscale for better OCR (a no-op for drafted JPEGs)
+        if image.mode != 'L':
+            image = image.convert('L')
         
-        # Convert to grayscale for better OCR
-        gray_image = image.convert('L')
+        # Resize large images for faster processing
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+        gray_image = image
         
         # Enhance contrast
         enhancer = ImageEnhance.Contrast(gray_image)
@@ -421,8 +618,8 @@ def extract_ingredients_from_image(image_bytes: bytes, api_key: Optional[str] =
         else:
             # Use easyocr
             import numpy as np
-            processed_image = gray_image.convert('RGB')
-            img_array = np.array(processed_image)
+            # easyocr accepts a 2-D grayscale array as is
+            img_array = np.asarray(gray_image)
             
             results = reader.readtext(
                 img_array,
@@ -0,0 +1,87 @@
+"""
+Persistent on-disk cache for LabelLens.
+
+Keeps OCR and analysis results across restarts and shares them between
+worker processes. Backed by the optional diskcache package; without it
+every lookup is a miss and nothing is stored.
+
+Keys include the prompt version and model name, so bumping PROMPT_VERSION
+or switching GROQ_MODEL stops serving results produced by the old ones,
+and every entry expires after CACHE_TTL regardless.
+"""
+
+import threading
+from typing import Any, Optional
+import logging
+
+from .config import CACHE_DIR, CACHE_SIZE_LIMIT, CACHE_TTL, GROQ_MODEL
+from .llm import PROMPT_VERSION
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+logger = logging.getLogger(__name__)
+
+_cache = None
+_cache_failed = False  # set once opening fails, so it is not retried per call
+_cache_lock = threading.Lock()
+
+
+def _get_cache():
+    """Open the on-disk cache once per process, or return None if unavailable."""
+    global _cache, _cache_failed
+    if _cache is None and not _cache_failed and diskcache is not None:
+        with _cache_lock:
+            if _cache is None and not _cache_failed:
+                try:
+                    _cache = diskcache.Cache(CACHE_DIR, size_limit=CACHE_SIZE_LIMIT)
+                    logger.info(f"Persistent cache opened at {CACHE_DIR}")
+                except Exception as e:
+                    _cache_failed = True
+                    logger.warning(f"Persistent cache unavailable, disabled for this process: {e}")
+    return _cache
+
+
+def _full_key(namespace: str, key: str) -> str:
+    return f"{namespace}:{PROMPT_VERSION}:{GROQ_MODEL}:{key}"
+
+
+def get_cached(namespace: str, key: str) -> Optional[Any]:
+    """
+    Look up a value stored by an earlier session or process.
+
+    Args:
+        namespace: Kind of value, e.g. "ocr" or "analysis"
+        key: Content-derived key within the namespace
+
+    Returns:
+        The stored value, or None on a miss
+    """
+    cache = _get_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(_full_key(namespace, key))
+    except Exception as e:
+        logger.warning(f"Persistent cache read failed: {e}")
+        return None
+
+
+def store(namespace: str, key: str, value: Any) -> None:
+    """
+    Store a value for later sessions and processes, for up to CACHE_TTL seconds.
+
+    Args:
+        namespace: Kind of value, e.g. "ocr" or "analysis"
+        key: Content-derived key within the namespace
+        value: Picklable value to store
+    """
+    cache = _get_cache()
+    if cache is None:
+        return
+    try:
+        cache.set(_full_key(namespace, key), value, expire=CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Persistent cache write failed: {e}")
@@ -6,28 +6,38 @@ concerns, and ingredient watchlists.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
-from enum import Enum
+from typing import List, Dict, Optional, Tuple
+from enum import IntEnum
 
 
-class ProfileType(Enum):
-    """Available health profile types."""
-    TYPE_2_DIABETES = "type_2_diabetes"
-    PCOS = "pcos"
-    HYPERTENSION = "hypertension"
-    IBS_LOW_FODMAP = "ibs_low_fodmap"
-    CELIAC = "celiac"
-    NUT_ALLERGY = "nut_allergy"
-    KIDNEY_DISEASE = "kidney_disease"
-    KETO = "keto"
-    AVOID_SEED_OILS = "avoid_seed_oils"
+class ProfileType(IntEnum):
+    """
+    Available health profile types.
+
+    Values are dense indices into HEALTH_PROFILES, so profiles hash and
+    compare as plain ints in session state and cache keys.
+    """
+    TYPE_2_DIABETES = 0
+    PCOS = 1
+    HYPERTENSION = 2
+    IBS_LOW_FODMAP = 3
+    CELIAC = 4
+    NUT_ALLERGY = 5
+    KIDNEY_DISEASE = 6
+    KETO = 7
+    AVOID_SEED_OILS = 8
     # Common Indian health conditions
-    THYROID_HYPOTHYROID = "thyroid_hypothyroid"
-    HEART_DISEASE = "heart_disease"
-    LACTOSE_INTOLERANCE = "lactose_intolerance"
-    GOUT_HIGH_URIC_ACID = "gout_high_uric_acid"
-    FATTY_LIVER = "fatty_liver"
-    GASTRITIS_GERD = "gastritis_gerd"
+    THYROID_HYPOTHYROID = 9
+    HEART_DISEASE = 10
+    LACTOSE_INTOLERANCE = 11
+    GOUT_HIGH_URIC_ACID = 12
+    FATTY_LIVER = 13
+    GASTRITIS_GERD = 14
+
+    @property
+    def slug(self) -> str:
+        """Stable string identifier, e.g. "type_2_diabetes", for widget keys and exports."""
+        return self.name.lower()
 
 
 @dataclass
@@ -52,9 +62,9 @@ class HealthProfile:
     severity_level: str = "moderate"  # low, moderate, high
 
 
-# Pre-defined health profiles with clinical context
-HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
-    ProfileType.TYPE_2_DIABETES: HealthProfile(
+# Pre-defined health profiles with clinical context, indexed by ProfileType
+HEALTH_PROFILES: Tuple[HealthProfile, ...] = (
+    HealthProfile(
         profile_type=ProfileType.TYPE_2_DIABETES,
         display_name="Type 2 Diabetes",
         description="Blood sugar management focus",
@@ -76,7 +86,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.PCOS: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.PCOS,
         display_name="PCOS (Polycystic Ovary Syndrome)",
         description="Insulin resistance and hormonal balance focus",
@@ -97,7 +107,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.HYPERTENSION: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.HYPERTENSION,
         display_name="Hypertension (High Blood Pressure)",
         description="Sodium and cardiovascular health focus",
@@ -119,7 +129,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.IBS_LOW_FODMAP: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.IBS_LOW_FODMAP,
         display_name="IBS (Low-FODMAP Diet)",
         description="Digestive health and FODMAP restriction focus",
@@ -143,7 +153,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.CELIAC: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.CELIAC,
         display_name="Celiac Disease (Gluten-Free)",
         description="Strict gluten avoidance required",
@@ -165,7 +175,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.NUT_ALLERGY: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.NUT_ALLERGY,
         display_name="Nut Allergy",
         description="Tree nut and peanut avoidance (potentially life-threatening)",
@@ -188,7 +198,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         severity_level="high"
     ),
     
-    ProfileType.KIDNEY_DISEASE: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.KIDNEY_DISEASE,
         display_name="Kidney Disease (Renal Diet)",
         description="Protein, potassium, phosphorus, and sodium management",
@@ -210,7 +220,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.KETO: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.KETO,
         display_name="Ketogenic Diet",
         description="Very low carbohydrate, high fat diet",
@@ -231,7 +241,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.AVOID_SEED_OILS: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.AVOID_SEED_OILS,
         display_name="Avoid Seed Oils",
         description="Avoiding industrial seed/vegetable oils",
@@ -255,7 +265,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
     ),
     
     # Common Indian Health Conditions
-    ProfileType.THYROID_HYPOTHYROID: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.THYROID_HYPOTHYROID,
         display_name="Thyroid (Hypothyroidism)",
         description="Thyroid function and metabolism support",
@@ -279,7 +289,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.HEART_DISEASE: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.HEART_DISEASE,
         display_name="Heart Disease (Cardiovascular)",
         description="Heart health and cholesterol management",
@@ -304,7 +314,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.LACTOSE_INTOLERANCE: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.LACTOSE_INTOLERANCE,
         display_name="Lactose Intolerance",
         description="Dairy and lactose avoidance",
@@ -329,7 +339,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.GOUT_HIGH_URIC_ACID: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.GOUT_HIGH_URIC_ACID,
         display_name="Gout / High Uric Acid",
         description="Purine restriction for uric acid management",
@@ -356,7 +366,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.FATTY_LIVER: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.FATTY_LIVER,
         display_name="Fatty Liver (NAFLD)",
         description="Liver health and fat reduction focus",
@@ -382,7 +392,7 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         """
     ),
     
-    ProfileType.GASTRITIS_GERD: HealthProfile(
+    HealthProfile(
         profile_type=ProfileType.GASTRITIS_GERD,
         display_name="Gastritis / Acid Reflux (GERD)",
         description="Stomach acid and digestive comfort management",
@@ -409,7 +419,14 @@ HEALTH_PROFILES: Dict[ProfileType, HealthProfile] = {
         Eating smaller meals and avoiding late-night eating helps.
         """
     ),
-}
+)
+
+# Profiles are looked up by ProfileType index, so a misordered table would
+# silently apply the wrong condition; checked even under python -O
+if len(HEALTH_PROFILES) != len(ProfileType) or any(
+    i != profile.profile_type for i, profile in enumerate(HEALTH_PROFILES)
+):
+    raise RuntimeError("HEALTH_PROFILES must list every ProfileType in enum order")
 
 
 @dataclass
@@ -421,13 +438,16 @@ class UserProfile:
     custom_restrictions: List[str] = field(default_factory=list)
     severity_preference: str = "balanced"  # strict, balanced, lenient
     
+    def __post_init__(self):
+        # Session state may hand us bare ints; normalize them once here
+        self.active_profiles = [ProfileType(p) for p in self.active_profiles]
+    
     def get_combined_context(self) -> str:
         """Generate combined clinical context for all active profiles."""
         contexts = []
         for profile_type in self.active_profiles:
-            if profile_type in HEALTH_PROFILES:
-                profile = HEALTH_PROFILES[profile_type]
-                contexts.append(f"**{profile.display_name}:**\n{profile.clinical_context}")
+            profile = HEALTH_PROFILES[profile_type]
+            contexts.append(f"**{profile.display_name}:**\n{profile.clinical_context}")
         
         if self.custom_restrictions:
             contexts.append(f"**Additional Restrictions:**\n{', '.join(self.custom_restrictions)}")
@@ -438,16 +458,14 @@ class UserProfile:
         """Get combined list of all keywords to watch for."""
         keywords = set()
         for profile_type in self.active_profiles:
-            if profile_type in HEALTH_PROFILES:
-                keywords.update(HEALTH_PROFILES[profile_type].avoid_keywords)
+            keywords.update(HEALTH_PROFILES[profile_type].avoid_keywords)
         return list(keywords)
     
     def get_display_names(self) -> List[str]:
         """Get human-readable names for all active profiles."""
         names = []
         for profile_type in self.active_profiles:
-            if profile_type in HEALTH_PROFILES:
-                names.append(HEALTH_PROFILES[profile_type].display_name)
+            names.append(HEALTH_PROFILES[profile_type].display_name)
         # Include custom restriction names if they look like profile names
         for restriction in self.custom_restrictions:
             if ":" in restriction:
@@ -460,18 +478,14 @@ class UserProfile:
     
     def has_high_severity_profile(self) -> bool:
         """Check if any profile is marked as high severity (e.g., allergies)."""
-        for profile_type in self.active_profiles:
-            if profile_type in HEALTH_PROFILES:
-                if HEALTH_PROFILES[profile_type].severity_level == "high":
-                    return True
-        return False
+        return any(
+            HEALTH_PROFILES[profile_type].severity_level == "high"
+            for profile_type in self.active_profiles
+        )
 
 
 def get_available_profiles() -> Dict[str, ProfileType]:
     """
     Returns a mapping of display names to profile types for UI selection.
     """
-    return {
-        HEALTH_PROFILES[pt].display_name: pt 
-        for pt in HEALTH_PROFILES
-    }
+    return {profile.display_name: profile.profile_type for profile in HEALTH_PROFILES}
@@ -0,0 +1,305 @@
+"""
+Build static assets for the LabelLens UI.
+
+Renders the decorative background images into static/ so the browser can
+draw pre-blurred bitmaps instead of running CSS blur filters every frame,
+and minifies static/labellens.css into the labellens.min.css the app
+serves. Uses only the standard library, so it runs anywhere the app does:
+
+    python scripts/build_assets.py
+"""
+
+import math
+import random
+import re
+import struct
+import zlib
+from pathlib import Path
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+
+# Viewport the original CSS orbs were laid out against
+REFERENCE_WIDTH = 1440
+REFERENCE_HEIGHT = 900
+
+# Former .orb elements: (diameter, center x, center y, (r, g, b), peak alpha).
+# Each was a radial gradient fading out at 70% of its radius under blur(80px).
+AURORA_ORBS = (
+    (500, 1290, 150, (168, 85, 247), 0.40),
+    (400, 100, 750, (6, 182, 212), 0.35),
+    (300, 720, 450, (244, 114, 182), 0.30),
+    (200, 1052, 370, (139, 92, 246), 0.50),
+    (350, 1345, 545, (6, 182, 212), 0.25),
+)
+AURORA_BLUR = 80
+AURORA_SCALE = 4.5  # reference pixels per output pixel; the image is all blur
+
+# Former .glow-effect: a 400px radial-gradient(circle, ...) under blur(60px).
+# Stops are (position along the gradient ray, (r, g, b), alpha).
+GLOW_SIZE = 400
+GLOW_STOPS = (
+    (0.0, (139, 92, 246), 0.2),
+    (0.3, (6, 182, 212), 0.1),
+    (0.7, (0, 0, 0), 0.0),
+)
+GLOW_BLUR = 60
+GLOW_SCALE = 4
+
+
+def write_png(path: Path, width: int, height: int, pixels) -> None:
+    """
+    Write an 8-bit RGBA PNG.
+
+    Args:
+        path: Destination file
+        width: Image width in pixels
+        height: Image height in pixels
+        pixels: Row-major iterable of rows, each a bytes-like of width * 4 RGBA values
+    """
+    raw = bytearray()
+    previous = bytes(width * 4)
+    for row in pixels:
+        row = bytes(row)
+        # "Up" filter: smooth gradients compress far better as row deltas
+        raw.append(2)
+        raw.extend((a - b) & 0xFF for a, b in zip(row, previous))
+        previous = row
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data)) + tag + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+        )
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(bytes(raw), 9))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _gaussian_blobs(blobs, width: int, height: int, scale: float):
+    """
+    Composite soft blobs into a premultiplied RGBA grid.
+
+    A radial gradient under a large Gaussian blur is itself close to a
+    Gaussian, so each blob is rendered directly as one with the same
+    total coverage as the blurred gradient.
+
+    Args:
+        blobs: Iterable of (diameter, cx, cy, rgb, alpha) in reference pixels
+        width: Output width
+        height: Output height
+        scale: Reference pixels per output pixel
+
+    Returns:
+        Rows of premultiplied [r, g, b, a] pixels
+    """
+    prepared = []
+    for diameter, cx, cy, rgb, alpha in blobs:
+        fade_radius = 0.35 * diameter
+        sigma = math.hypot(fade_radius / 2.5, AURORA_BLUR)
+        # Match the volume of a cone of height alpha and radius fade_radius
+        peak = alpha * fade_radius ** 2 / (6 * sigma ** 2)
+        prepared.append((cx / scale, cy / scale, 2 * (sigma / scale) ** 2, rgb, peak))
+
+    grid = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            # Porter-Duff "over" in premultiplied space
+            r = g = b = a = 0.0
+            for bx, by, two_var, (cr, cg, cb), peak in prepared:
+                dx, dy = x + 0.5 - bx, y + 0.5 - by
+                src = peak * math.exp(-(dx * dx + dy * dy) / two_var)
+                r = cr * src + r * (1 - src)
+                g = cg * src + g * (1 - src)
+                b = cb * src + b * (1 - src)
+                a = src + a * (1 - src)
+            row.append([r, g, b, a])
+        grid.append(row)
+    return grid
+
+
+def _radial_gradient(size: int, stops, margin: int):
+    """
+    Rasterize a CSS radial-gradient(circle, ...) into premultiplied RGBA floats.
+
+    Args:
+        size: Element width and height in pixels
+        stops: Tuple of (position, rgb, alpha) color stops
+        margin: Transparent border added on every side
+
+    Returns:
+        Square grid (list of rows of [r, g, b, a]) of side size + 2 * margin
+    """
+    # "circle" without a size keyword extends to the farthest corner
+    ray = math.hypot(size / 2, size / 2)
+    side = size + 2 * margin
+    center = side / 2
+    grid = []
+    for y in range(side):
+        row = []
+        for x in range(side):
+            t = math.hypot(x + 0.5 - center, y + 0.5 - center) / ray
+            pixel = [0.0, 0.0, 0.0, 0.0]
+            for (t0, c0, a0), (t1, c1, a1) in zip(stops, stops[1:]):
+                if t0 <= t <= t1:
+                    # CSS interpolates gradient colors in premultiplied space
+                    f = (t - t0) / (t1 - t0)
+                    pixel = [
+                        ch0 * a0 * (1 - f) + ch1 * a1 * f
+                        for ch0, ch1 in zip(c0, c1)
+                    ] + [a0 * (1 - f) + a1 * f]
+                    break
+            row.append(pixel)
+        grid.append(row)
+    return grid
+
+
+def _blur(grid, sigma: float):
+    """
+    Apply a separable Gaussian blur, matching CSS blur(sigma).
+
+    Args:
+        grid: Square grid of premultiplied [r, g, b, a] pixels
+        sigma: Standard deviation in pixels
+
+    Returns:
+        New blurred grid of the same size
+    """
+    radius = int(math.ceil(3 * sigma))
+    weights = [math.exp(-(k * k) / (2 * sigma * sigma)) for k in range(-radius, radius + 1)]
+    total = sum(weights)
+    weights = [w / total for w in weights]
+    side = len(grid)
+
+    def blur_line(line):
+        out = []
+        for i in range(side):
+            acc = [0.0, 0.0, 0.0, 0.0]
+            for k, w in enumerate(weights):
+                j = i + k - radius
+                if 0 <= j < side:
+                    px = line[j]
+                    for c in range(4):
+                        acc[c] += px[c] * w
+            out.append(acc)
+        return out
+
+    rows = [blur_line(row) for row in grid]
+    columns = [blur_line([rows[y][x] for y in range(side)]) for x in range(side)]
+    return [[columns[x][y] for x in range(side)] for y in range(side)]
+
+
+def _premultiplied_rows(grid, seed: int = 0):
+    """
+    Convert a premultiplied float grid into straight-alpha RGBA rows.
+
+    Args:
+        grid: Rows of premultiplied [r, g, b, a] pixels
+        seed: Dither seed, fixed so rebuilds are byte-identical
+
+    Yields:
+        bytearray rows of straight-alpha RGBA
+    """
+    dither = random.Random(seed)
+    for grid_row in grid:
+        row = bytearray(len(grid_row) * 4)
+        for x, (r, g, b, a) in enumerate(grid_row):
+            offset = x * 4
+            if a > 0:
+                row[offset] = min(255, round(r / a))
+                row[offset + 1] = min(255, round(g / a))
+                row[offset + 2] = min(255, round(b / a))
+            # Dither alpha to hide banding across so few levels
+            row[offset + 3] = max(0, min(255, int(a * 255 + dither.random())))
+        yield row
+
+
+def build_aurora() -> Path:
+    """Render the pre-blurred orb backdrop that replaces the animated .orb divs."""
+    width = round(REFERENCE_WIDTH / AURORA_SCALE)
+    height = round(REFERENCE_HEIGHT / AURORA_SCALE)
+    path = STATIC_DIR / "aurora_bg.png"
+    grid = _gaussian_blobs(AURORA_ORBS, width, height, AURORA_SCALE)
+    write_png(path, width, height, _premultiplied_rows(grid))
+    return path
+
+
+def build_glow() -> Path:
+    """
+    Render the pre-blurred .glow-effect sprite.
+
+    The bitmap includes a 3-sigma margin on each side so the blur's falloff
+    is not clipped; the CSS sizes the element to match.
+    """
+    size = GLOW_SIZE // GLOW_SCALE
+    margin = int(math.ceil(3 * GLOW_BLUR / GLOW_SCALE))
+    grid = _blur(_radial_gradient(size, GLOW_STOPS, margin), GLOW_BLUR / GLOW_SCALE)
+    side = len(grid)
+    path = STATIC_DIR / "glow.png"
+    write_png(path, side, side, _premultiplied_rows(grid))
+    return path
+
+
+# Comments, quoted strings, whitespace runs, punctuation, everything else
+_CSS_TOKEN_RE = re.compile(
+    r"""/\*.*?\*/|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|\s+|[{};,>]|[^"'/\s{};,>]+|/""",
+    re.S
+)
+_CSS_TIGHT = set("{};,>")
+
+
+def minify_css(css: str) -> str:
+    """
+    Strip comments and insignificant whitespace from a stylesheet.
+
+    Deliberately conservative: quoted strings are copied verbatim and only
+    whitespace next to braces, semicolons, commas, child combinators and
+    after colons is dropped, so selectors and values keep their meaning.
+
+    Args:
+        css: Stylesheet source
+
+    Returns:
+        Minified stylesheet
+    """
+    out = []
+    pending_space = False
+    for token in _CSS_TOKEN_RE.findall(css):
+        if token.startswith("/*"):
+            continue
+        if token.isspace():
+            pending_space = True
+            continue
+        if pending_space and out:
+            prev = out[-1][-1]
+            if prev not in _CSS_TIGHT and prev != ":" and token[0] not in _CSS_TIGHT:
+                out.append(" ")
+        pending_space = False
+        if token == "}" and out and out[-1] == ";":
+            out.pop()
+        out.append(token)
+    return "".join(out)
+
+
+def build_stylesheet() -> Path:
+    """Minify static/labellens.css into static/labellens.min.css."""
+    path = STATIC_DIR / "labellens.min.css"
+    source = (STATIC_DIR / "labellens.css").read_text(encoding="utf-8")
+    path.write_text(minify_css(source) + "\n", encoding="utf-8")
+    return path
+
+
+def main() -> None:
+    STATIC_DIR.mkdir(exist_ok=True)
+    for build in (build_aurora, build_glow, build_stylesheet):
+        path = build()
+        print(f"wrote {path.relative_to(STATIC_DIR.parent)} ({path.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Tests for the near-duplicate tier of labellens.cache."""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from labellens.cache import AnalysisCache, _only_ocr_noise, analysis_key, normalize_ingredients
+
+
+def _items(text):
+    return tuple(normalize_ingredients(text).split(", "))
+
+
+def test_normalize_keeps_label_order():
+    assert normalize_ingredients("Sugar, Flour, Salt") == "sugar, flour, salt"
+    assert analysis_key("Sugar, Flour", "p") != analysis_key("Flour, Sugar", "p")
+
+
+@pytest.mark.parametrize("scanned, stored", [
+    ("Sugal, Water", "Sugar, Water"),
+    ("Sodium propionale", "Sodium propionate"),
+    ("Apple cider vinegr", "Apple cider vinegar"),
+])
+def test_misreads_are_noise(scanned, stored):
+    assert _only_ocr_noise(_items(scanned), _items(stored))
+
+
+@pytest.mark.parametrize("scanned, stored", [
+    ("Yellow 5, Sugar", "Yellow 6, Sugar"),
+    ("Red 40, Sugar", "Red 3, Sugar"),
+    ("Sodium nitrite, Salt", "Sodium nitrate, Salt"),
+    ("Rice flour, Salt", "Rye flour, Salt"),
+    ("Malt, Sugar", "Salt, Sugar"),
+    ("0il, Sugar", "Oil, Sugar"),
+    ("Sugar, Flour", "Flour, Sugar"),
+])
+def test_substitutions_are_not_noise(scanned, stored):
+    assert not _only_ocr_noise(_items(scanned), _items(stored))
+
+
+def test_guard_term_items_must_match_exactly():
+    scanned, stored = _items("Sodium propionale"), _items("Sodium propionate")
+    assert not _only_ocr_noise(scanned, stored, ("propionate",))
+
+
+def test_fuzzy_hit_only_for_misread():
+    cache = AnalysisCache(max_entries=4)
+    cache.put("Water, Sugar, Sodium propionate, Citric acid", "p", "stored")
+    assert cache.get("Water, Sugar, Sodium propionale, Citric acid", "p") == "stored"
+    assert cache.get("Water, Sugar, Sodium nitrate, Citric acid", "p") is None
+    assert cache.get("Sugar, Water, Sodium propionate, Citric acid", "p") is None